@@ -16,11 +16,15 @@ from monitoring.threat_intel import ThreatIntelligence
 from utils.encryption import EncryptionManager
 from utils.email_notifier import EmailNotifier
 from utils.logger import SecurityLogger
+from utils import fast_json
+from utils.fast_json import FastJSONProvider
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'sentinelwatch-pro-2025')
-socketio = SocketIO(app, cors_allowed_origins="*")
+if FastJSONProvider is not None:
+    app.json = FastJSONProvider(app)
+socketio = SocketIO(app, cors_allowed_origins="*", json=fast_json)
 
 # Global variables
 running = True
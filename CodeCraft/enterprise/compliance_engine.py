@@ -4,6 +4,7 @@ Advanced compliance monitoring for SOC 2, PCI DSS, GDPR, ISO 27001, and more
 """
 
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import json
@@ -29,21 +30,55 @@ class ComplianceEngine:
             'GDPR': self._init_gdpr_controls(),
             'ISO27001': self._init_iso27001_controls()
         }
-    
+
+        # Pre-bind one assessor per framework so per-call dispatch is a
+        # single dict lookup instead of validation + rule lookup
+        self._assessors = {
+            framework: partial(self._run_controls, controls)
+            for framework, controls in self.frameworks.items()
+        }
+
+        # Memoize assessments for identical event windows (results only
+        # change when new events arrive)
+        self._result_cache: Dict[tuple, List[ComplianceResult]] = {}
+
     def assess_compliance(self, framework: str, security_events: List[Dict]) -> List[ComplianceResult]:
         """Comprehensive compliance assessment"""
-        results = []
-        
-        if framework not in self.frameworks:
-            return results
-        
-        controls = self.frameworks[framework]
-        
-        for control_id, control_info in controls.items():
-            result = self._assess_control(control_id, control_info, security_events)
-            results.append(result)
-        
+        assessor = self._assessors.get(framework)
+        if assessor is None:
+            return []
+
+        cache_key = self._events_fingerprint(framework, security_events)
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        results = assessor(security_events)
+
+        if cache_key is not None:
+            if len(self._result_cache) >= 8:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[cache_key] = results
+
         return results
+
+    def _run_controls(self, controls: Dict, security_events: List[Dict]) -> List[ComplianceResult]:
+        """Assess every control in a pre-compiled rule set"""
+        return [
+            self._assess_control(control_id, control_info, security_events)
+            for control_id, control_info in controls.items()
+        ]
+
+    def _events_fingerprint(self, framework: str, events: List[Dict]) -> Optional[tuple]:
+        """Cheap identity key for an event window (None disables caching)"""
+        if not events:
+            return (framework, 0, None)
+        last = events[-1]
+        timestamp = last.get('timestamp')
+        if timestamp is None:
+            return None
+        return (framework, len(events), timestamp)
     
     def _init_soc2_controls(self) -> Dict:
         """SOC 2 Trust Services Criteria"""
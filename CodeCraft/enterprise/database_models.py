@@ -333,6 +333,10 @@ Index('idx_incidents_status_priority', SecurityIncident.status, SecurityIncident
 Index('idx_threat_intel_type_value', ThreatIntelligence.ioc_type, ThreatIntelligence.ioc_value)
 Index('idx_assets_ip_hostname', Asset.ip_address, Asset.hostname)
 Index('idx_metrics_hostname_timestamp', SystemMetrics.hostname, SystemMetrics.timestamp)
+Index('ix_incidents_status_created', SecurityIncident.status, SecurityIncident.created_at.desc())
+Index('ix_incidents_active_created', SecurityIncident.created_at,
+      postgresql_where=SecurityIncident.status.in_(['new', 'assigned', 'investigating']))
+Index('ix_alerts_created', Alert.created_at)
 
 def init_database(app):
     """Initialize database with Flask app"""
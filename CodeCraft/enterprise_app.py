@@ -8,18 +8,38 @@ import os
 import sys
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify, render_template
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 import threading
 import logging
+from bisect import bisect_right
 from typing import Dict, List, Any
 
+# Threat-score classification tables (threshold lookup instead of if/elif chains)
+_SEVERITY_BREAKS = (0.4, 0.6, 0.8)
+_SEVERITY_NAMES = ('low', 'medium', 'high', 'critical')
+_PRIORITY_BREAKS = (0.2, 0.4, 0.6, 0.8)
+_PRIORITY_LEVELS = (5, 4, 3, 2, 1)
+
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional scheduler for periodic jobs (compliance assessments)
+try:
+    from apscheduler.schedulers.background import BackgroundScheduler
+except ImportError:
+    BackgroundScheduler = None
+
+# Optional fast JSON encoder for database JSON columns
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Core monitoring modules  
 from monitoring.system_monitor import SystemMonitor
 from monitoring.network_monitor import NetworkMonitor
@@ -27,6 +47,8 @@ from monitoring.file_monitor import FileMonitor
 from monitoring.threat_intel import ThreatIntelligenceManager
 from utils.encryption import EncryptionManager
 from utils.logger import SecurityLogger
+from utils import fast_json
+from utils.fast_json import FastJSONProvider
 
 # Enterprise modules with fallback
 ENTERPRISE_FEATURES_AVAILABLE = False
@@ -46,6 +68,7 @@ class AIThreatDetectionEngine:
         from collections import namedtuple
         Score = namedtuple('ThreatScore', ['overall_score', 'confidence', 'risk_factors', 'recommended_action', 'explanation'])
         return Score(0.0, 0.0, [], 'monitor', 'Enterprise AI features available in full version')
+    def analyze_events(self, events): return [self.analyze_event(e) for e in events]
     def get_ai_statistics(self): return {'model_trained': False, 'events_analyzed': 0}
 
 class ComplianceEngine:
@@ -67,9 +90,17 @@ class SentinelWatchEnterprise:
         self.app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-sentinel-key')
         self.app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL')
         self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        if orjson is not None:
+            self.app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+                'json_serializer': lambda obj: orjson.dumps(obj).decode('utf-8')
+            }
         
+        # Fast JSON encoding for all responses and socket payloads
+        if FastJSONProvider is not None:
+            self.app.json = FastJSONProvider(self.app)
+
         # Initialize enterprise components
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode='threading')
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode='threading', json=fast_json)
         self.jwt = JWTManager(self.app)
         
         # Initialize database (fallback to None for demo)
@@ -97,7 +128,29 @@ class SentinelWatchEnterprise:
             'ai_predictions': 0,
             'compliance_assessments': 0
         }
-        
+
+        # Last broadcast snapshot, used to emit deltas instead of full payloads
+        self._last_enterprise_update = {}
+
+        # Environment-derived configuration, read once instead of per lookup
+        self._static_config = {
+            'siem_endpoint': os.environ.get('SIEM_ENDPOINT', 'https://splunk.company.com'),
+            'siem_token': os.environ.get('SIEM_TOKEN', ''),
+            'guardduty_detector_id': os.environ.get('GUARDDUTY_DETECTOR_ID', ''),
+            'aws_enabled': bool(os.environ.get('AWS_ACCESS_KEY_ID')),
+            'virustotal_api_key': os.environ.get('VIRUSTOTAL_API_KEY', ''),
+            'otx_api_key': os.environ.get('OTX_API_KEY', ''),
+            'teams_webhook': os.environ.get('TEAMS_WEBHOOK', ''),
+            'slack_webhook': os.environ.get('SLACK_WEBHOOK', '')
+        }
+
+        # Short-lived memo for status calls hammered by dashboard polling
+        self._status_cache = {}
+
+        # Compliance scheduling state (scheduler attached below, after monitoring starts)
+        self.scheduler = None
+        self._last_compliance_check = datetime.utcnow()
+
         # Initialize enterprise integrations
         self._setup_enterprise_integrations()
         
@@ -115,73 +168,84 @@ class SentinelWatchEnterprise:
         
         # Start integration health monitoring
         self.integration_orchestrator.start_health_monitoring()
-        
+
+        # Schedule compliance assessments to fire exactly once every 6 hours
+        if BackgroundScheduler is not None:
+            self.scheduler = BackgroundScheduler(daemon=True)
+            self.scheduler.add_job(
+                lambda: asyncio.run(self._perform_compliance_check()),
+                'cron', hour='0,6,12,18'
+            )
+            self.scheduler.start()
+
         logger.info("SentinelWatch Pro Enterprise initialized successfully")
     
     def _setup_enterprise_integrations(self):
         """Setup enterprise-grade integrations"""
         try:
+            env = self._static_config
+
             # Example SIEM integration (would be configured via UI/API)
             siem_config = {
                 'name': 'Enterprise SIEM',
                 'siem_type': 'splunk',  # or qradar, sentinel
-                'api_endpoint': os.environ.get('SIEM_ENDPOINT', 'https://splunk.company.com'),
-                'auth_token': os.environ.get('SIEM_TOKEN', ''),
-                'enabled': bool(os.environ.get('SIEM_TOKEN'))
+                'api_endpoint': env['siem_endpoint'],
+                'auth_token': env['siem_token'],
+                'enabled': bool(env['siem_token'])
             }
-            
+
             if siem_config['enabled']:
                 siem_integration = SIEMIntegration(siem_config)
                 self.integration_orchestrator.register_integration('siem', siem_integration)
                 self.stats['integrations_active'] += 1
-            
+
             # Cloud security integration
             cloud_config = {
                 'name': 'Cloud Security',
                 'provider': 'aws',  # or azure, gcp
                 'region': 'us-east-1',
-                'detector_id': os.environ.get('GUARDDUTY_DETECTOR_ID', ''),
-                'enabled': bool(os.environ.get('AWS_ACCESS_KEY_ID'))
+                'detector_id': env['guardduty_detector_id'],
+                'enabled': env['aws_enabled']
             }
-            
+
             if cloud_config['enabled']:
                 cloud_integration = CloudSecurityIntegration(cloud_config)
                 self.integration_orchestrator.register_integration('cloud', cloud_integration)
                 self.stats['integrations_active'] += 1
-            
+
             # Threat intelligence integration
             threat_intel_config = {
                 'name': 'Threat Intelligence',
                 'providers': ['virustotal', 'otx'],
                 'api_keys': {
-                    'virustotal': os.environ.get('VIRUSTOTAL_API_KEY', ''),
-                    'otx': os.environ.get('OTX_API_KEY', '')
+                    'virustotal': env['virustotal_api_key'],
+                    'otx': env['otx_api_key']
                 },
-                'enabled': bool(os.environ.get('VIRUSTOTAL_API_KEY') or os.environ.get('OTX_API_KEY'))
+                'enabled': bool(env['virustotal_api_key'] or env['otx_api_key'])
             }
-            
+
             if threat_intel_config['enabled']:
                 threat_integration = ThreatIntelligenceIntegration(threat_intel_config)
                 self.integration_orchestrator.register_integration('threat_intel', threat_integration)
                 self.stats['integrations_active'] += 1
-            
+
             # Communication integration (Teams, Slack)
             comm_config = {
                 'name': 'Communications',
                 'channels': {
                     'teams': {
-                        'webhook_url': os.environ.get('TEAMS_WEBHOOK', ''),
+                        'webhook_url': env['teams_webhook'],
                         'critical': True,
                         'high': True
                     },
                     'slack': {
-                        'webhook_url': os.environ.get('SLACK_WEBHOOK', ''),
+                        'webhook_url': env['slack_webhook'],
                         'channel': '#security-alerts',
                         'critical': True,
                         'high': True
                     }
                 },
-                'enabled': bool(os.environ.get('TEAMS_WEBHOOK') or os.environ.get('SLACK_WEBHOOK'))
+                'enabled': bool(env['teams_webhook'] or env['slack_webhook'])
             }
             
             if comm_config['enabled']:
@@ -224,8 +288,8 @@ class SentinelWatchEnterprise:
                 # Get real-time statistics
                 current_stats = {
                     **self.stats,
-                    'ai_engine_status': self.ai_engine.get_ai_statistics(),
-                    'integration_status': self.integration_orchestrator.get_integration_status(),
+                    'ai_engine_status': self._cached_status('ai_statistics', self.ai_engine.get_ai_statistics),
+                    'integration_status': self._cached_status('integration_status', self.integration_orchestrator.get_integration_status),
                     'active_incidents': self._count_active_incidents(),
                     'threat_level': self._calculate_current_threat_level(),
                     'compliance_score': self._get_overall_compliance_score()
@@ -324,18 +388,16 @@ class SentinelWatchEnterprise:
             """Test enterprise integrations"""
             try:
                 integration_name = request.json.get('integration_name')
-                
-                if integration_name in self.integration_orchestrator.integrations:
-                    integration = self.integration_orchestrator.integrations[integration_name]
-                    is_healthy = integration.is_healthy()
-                    
-                    return jsonify({
-                        'integration_name': integration_name,
-                        'status': 'healthy' if is_healthy else 'unhealthy',
-                        'test_timestamp': datetime.utcnow().isoformat()
-                    })
-                
-                return jsonify({'error': 'Integration not found'}), 404
+
+                integration = self.integration_orchestrator.integrations.get(integration_name)
+                if integration is None:
+                    return jsonify({'error': 'Integration not found'}), 404
+
+                return jsonify({
+                    'integration_name': integration_name,
+                    'status': 'healthy' if integration.is_healthy() else 'unhealthy',
+                    'test_timestamp': datetime.utcnow().isoformat()
+                })
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
     
@@ -356,10 +418,14 @@ class SentinelWatchEnterprise:
         @self.socketio.on('subscribe_enterprise_updates')
         def handle_subscribe():
             """Subscribe to enterprise updates"""
+            join_room('enterprise_updates')
             emit('subscription_confirmed', {
                 'message': 'Subscribed to enterprise security updates',
                 'features': ['ai_threats', 'integrations', 'compliance', 'incidents']
             })
+            # New subscribers need a full snapshot before deltas make sense
+            if self._last_enterprise_update:
+                emit('enterprise_update', self._last_enterprise_update)
     
     def _enterprise_monitoring_loop(self):
         """Main enterprise monitoring loop"""
@@ -367,6 +433,9 @@ class SentinelWatchEnterprise:
         
         while self.monitoring_active:
             try:
+                # One timestamp per tick; sub-second skew between events is irrelevant
+                tick_iso = datetime.utcnow().isoformat()
+
                 # Get system metrics
                 system_metrics = self.system_monitor.get_metrics()
                 
@@ -376,42 +445,42 @@ class SentinelWatchEnterprise:
                 # Get network activity
                 network_activity = self.network_monitor.get_connections()
                 
-                # Process each connection with AI analysis
-                for connection in network_activity:
-                    threat_score = self.ai_engine.analyze_event({
-                        'category': 'network',
-                        'source_ip': connection.get('local_address'),
-                        'destination_ip': connection.get('remote_address'),
-                        'destination_port': connection.get('remote_port'),
-                        'process_name': connection.get('process_name'),
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'medium'
-                    })
-                    
+                # Analyze all connections in one AI batch
+                network_events = [{
+                    'category': 'network',
+                    'source_ip': connection.get('local_address'),
+                    'destination_ip': connection.get('remote_address'),
+                    'destination_port': connection.get('remote_port'),
+                    'process_name': connection.get('process_name'),
+                    'timestamp': tick_iso,
+                    'severity': 'medium'
+                } for connection in network_activity]
+
+                for connection, threat_score in zip(network_activity, self.ai_engine.analyze_events(network_events)):
                     # Create incident if threat score is high
                     if threat_score.overall_score > 0.7:
                         self._create_security_incident(connection, threat_score)
-                
-                # Check for file system changes
+
+                # Check for file system changes, analyzed as one batch
                 file_changes = self.file_monitor.get_changes()
-                for change in file_changes:
-                    # Analyze file change with AI
-                    threat_score = self.ai_engine.analyze_event({
-                        'category': 'file_system',
-                        'file_path': change.get('path'),
-                        'action': change.get('action'),
-                        'process_name': change.get('process'),
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'medium'
-                    })
-                    
+                file_events = [{
+                    'category': 'file_system',
+                    'file_path': change.get('path'),
+                    'action': change.get('action'),
+                    'process_name': change.get('process'),
+                    'timestamp': tick_iso,
+                    'severity': 'medium'
+                } for change in file_changes]
+
+                for change, threat_score in zip(file_changes, self.ai_engine.analyze_events(file_events)):
                     if threat_score.overall_score > 0.6:
                         self._create_security_alert(change, threat_score)
                 
-                # Periodic compliance assessment
-                if datetime.utcnow().hour % 6 == 0:  # Every 6 hours
+                # Periodic compliance assessment (fallback when APScheduler is unavailable)
+                if self.scheduler is None and datetime.utcnow() - self._last_compliance_check >= timedelta(hours=6):
+                    self._last_compliance_check = datetime.utcnow()
                     asyncio.run(self._perform_compliance_check())
-                
+
                 # Broadcast real-time updates
                 self._broadcast_enterprise_updates(system_metrics, network_activity)
                 
@@ -460,7 +529,7 @@ class SentinelWatchEnterprise:
                     category='network_security',
                     source='ai_detection',
                     priority=self._score_to_priority(threat_score.overall_score),
-                    evidence={'event_data': event_data, 'ai_analysis': threat_score.__dict__},
+                    evidence={'event_data': event_data, 'ai_analysis': self._threat_score_to_payload(threat_score)},
                     created_at=datetime.utcnow()
                 )
                 
@@ -490,7 +559,7 @@ class SentinelWatchEnterprise:
                     source_system='ai_engine',
                     status='new',
                     event_time=datetime.utcnow(),
-                    raw_data={'event': event_data, 'ai_score': threat_score.__dict__}
+                    raw_data={'event': event_data, 'ai_score': self._threat_score_to_payload(threat_score)}
                 )
                 
                 self.db.session.add(alert)
@@ -514,7 +583,7 @@ class SentinelWatchEnterprise:
         logger.info(f"Broadcasted incident {incident.incident_id} to {len(results)} integrations")
     
     def _broadcast_enterprise_updates(self, system_metrics: Dict, network_activity: List):
-        """Broadcast real-time updates to connected clients"""
+        """Broadcast delta updates to subscribed clients"""
         try:
             enterprise_update = {
                 'timestamp': datetime.utcnow().isoformat(),
@@ -525,11 +594,34 @@ class SentinelWatchEnterprise:
                 'integration_count': self.stats['integrations_active'],
                 'recent_incidents': self._get_recent_incidents_count()
             }
-            
-            self.socketio.emit('enterprise_update', enterprise_update)
-            
+
+            delta = self._diff_enterprise_update(self._last_enterprise_update, enterprise_update)
+            self._last_enterprise_update = enterprise_update
+
+            if delta:
+                self.socketio.emit('enterprise_update', delta, room='enterprise_updates')
+
         except Exception as e:
             logger.error(f"Failed to broadcast enterprise updates: {e}")
+
+    def _diff_enterprise_update(self, previous: Dict, current: Dict) -> Dict:
+        """Keep only fields that changed since the last broadcast"""
+        if not previous:
+            return current
+
+        delta = {'timestamp': current['timestamp']}
+        for key, value in current.items():
+            if key == 'timestamp':
+                continue
+            old_value = previous.get(key)
+            if isinstance(value, float) and isinstance(old_value, float):
+                if abs(value - old_value) > 0.01:
+                    delta[key] = value
+            elif value != old_value:
+                delta[key] = value
+
+        # Timestamp alone is not worth a broadcast
+        return delta if len(delta) > 1 else {}
     
     async def _perform_compliance_check(self):
         """Perform periodic compliance assessment"""
@@ -549,29 +641,31 @@ class SentinelWatchEnterprise:
             logger.error(f"Compliance check failed: {e}")
     
     # Utility methods
+    def _cached_status(self, key: str, fetch, ttl: float = 2.0):
+        """Memoize a status call for a short TTL (dashboard polls at ~1Hz)"""
+        now = time.monotonic()
+        cached = self._status_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        value = fetch()
+        self._status_cache[key] = (now + ttl, value)
+        return value
+
+    def _threat_score_to_payload(self, threat_score) -> Dict[str, Any]:
+        """Compact JSON payload for a threat score (explanation/risk factors live elsewhere)"""
+        return {
+            'score': threat_score.overall_score,
+            'confidence': threat_score.confidence,
+            'action': threat_score.recommended_action
+        }
+
     def _score_to_severity(self, score: float) -> str:
         """Convert AI threat score to severity level"""
-        if score >= 0.8:
-            return 'critical'
-        elif score >= 0.6:
-            return 'high'
-        elif score >= 0.4:
-            return 'medium'
-        else:
-            return 'low'
-    
+        return _SEVERITY_NAMES[bisect_right(_SEVERITY_BREAKS, score)]
+
     def _score_to_priority(self, score: float) -> int:
         """Convert AI threat score to priority (1=highest, 5=lowest)"""
-        if score >= 0.8:
-            return 1
-        elif score >= 0.6:
-            return 2
-        elif score >= 0.4:
-            return 3
-        elif score >= 0.2:
-            return 4
-        else:
-            return 5
+        return _PRIORITY_LEVELS[bisect_right(_PRIORITY_BREAKS, score)]
     
     def _calculate_current_threat_level(self) -> str:
         """Calculate current organizational threat level"""
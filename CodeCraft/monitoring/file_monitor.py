@@ -1,16 +1,59 @@
 import os
 import hashlib
+import mmap
+import queue
+import re
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+# Prefer the OpenSSL-backed SHA-256, which dispatches to SHA-NI instructions
+# at runtime on CPUs that have them (same code path sha256sum uses)
+try:
+    from _hashlib import openssl_sha256 as _sha256_factory
+except ImportError:
+    _sha256_factory = hashlib.sha256
+
+_file_digest = getattr(hashlib, 'file_digest', None)
+
+_HASH_CHUNK_SIZE = 64 * 1024
+_INTEGRITY_CACHE_SIZE = 10000
+
+# Temporary/system files to skip, matched in one pass by a precompiled
+# case-insensitive alternation instead of a per-pattern substring scan
+_IGNORE_PATTERNS = [
+    '.tmp', '.log', '.swp', '.swo', '~',
+    '.DS_Store', 'Thumbs.db', '.git/',
+    '__pycache__/', '.pyc', '.pyo'
+]
+_IGNORE_RE = re.compile('|'.join(map(re.escape, _IGNORE_PATTERNS)), re.IGNORECASE)
+
+# (epoch second, formatted string) cache for event timestamps
+_ISO_CACHE = (-1, '')
+
+def _isoformat_now():
+    """Second-resolution ISO timestamp, reformatted only when the second rolls over"""
+    global _ISO_CACHE
+    second = int(time.time())
+    cached_second, cached_value = _ISO_CACHE
+    if second != cached_second:
+        cached_value = datetime.now().isoformat(timespec='seconds')
+        _ISO_CACHE = (second, cached_value)
+    return cached_value
+
 class FileSystemEventHandlerCustom(FileSystemEventHandler):
-    def __init__(self, callback, config):
+    def __init__(self, callback, config, hash_pool=None):
         self.callback = callback
         self.config = config
-        self.file_hashes = {}
+        # Stat + hash work runs on this pool so the watchdog dispatcher
+        # thread only does the cheap ignore check per event
+        self._hash_pool = hash_pool
+        # path -> (size, mtime_ns, hash); stat identity short-circuits re-hashing
+        self.file_meta = {}
         self.lock = threading.Lock()
         
     def on_modified(self, event):
@@ -31,42 +74,65 @@ class FileSystemEventHandlerCustom(FileSystemEventHandler):
     
     def _handle_file_event(self, file_path, event_type):
         """Handle file system events"""
+        # Skip temporary files and system files
+        if self._should_ignore_file(file_path):
+            return
+
+        # Hand off to the hash pool: a slow hash of a large file must not
+        # stall the dispatcher and overflow the kernel event queue
+        if self._hash_pool is not None:
+            self._hash_pool.submit(self._process_file_event, file_path, event_type)
+        else:
+            self._process_file_event(file_path, event_type)
+
+    def _process_file_event(self, file_path, event_type):
+        """Stat, hash and alert for one file event (runs on a pool worker)"""
         try:
-            # Skip temporary files and system files
-            if self._should_ignore_file(file_path):
-                return
-            
-            file_info = {
-                'file_path': file_path,
-                'event_type': event_type,
-                'timestamp': datetime.now().isoformat(),
-                'file_size': os.path.getsize(file_path) if os.path.exists(file_path) else 0
-            }
-            
+            stat_result = None
+            if event_type != 'deleted':
+                try:
+                    stat_result = os.stat(file_path)
+                except OSError:
+                    stat_result = None
+
+            if event_type == 'deleted':
+                with self.lock:
+                    self.file_meta.pop(file_path, None)
+
             # Calculate file hash for integrity checking
-            if event_type in ['created', 'modified'] and os.path.exists(file_path):
-                file_hash = self._calculate_file_hash(file_path)
-                file_info['file_hash'] = file_hash
-                
+            file_hash = None
+            if event_type in ['created', 'modified'] and stat_result is not None:
                 with self.lock:
-                    # Check if file hash has changed (for modified files)
-                    if event_type == 'modified' and file_path in self.file_hashes:
-                        if self.file_hashes[file_path] == file_hash:
-                            return  # File content hasn't actually changed
-                    
-                    self.file_hashes[file_path] = file_hash
-            
-            # Determine alert severity
-            severity = self._determine_severity(file_path, event_type)
-            
+                    cached = self.file_meta.get(file_path)
+
+                # Same size and mtime_ns means same content; skip the read entirely
+                if cached and cached[0] == stat_result.st_size and cached[1] == stat_result.st_mtime_ns:
+                    if event_type == 'modified':
+                        return
+                    file_hash = cached[2]
+                else:
+                    file_hash = self._calculate_file_hash(file_path)
+                    with self.lock:
+                        self.file_meta[file_path] = (stat_result.st_size, stat_result.st_mtime_ns, file_hash)
+                    # Metadata changed but content didn't (e.g. touch)
+                    if event_type == 'modified' and cached and cached[2] == file_hash:
+                        return
+
+            # One flat literal: CPython sizes the dict once, no intermediate
+            # file_info dict or **-merge rehash per event
             alert = {
                 'type': 'file',
-                'severity': severity,
+                'severity': self._determine_severity(file_path, event_type),
                 'title': f'File {event_type.title()}',
                 'message': f'File {event_type}: {file_path}',
-                **file_info
+                'file_path': file_path,
+                'event_type': event_type,
+                'timestamp': _isoformat_now(),
+                'file_size': stat_result.st_size if stat_result else 0
             }
-            
+            if file_hash is not None:
+                alert['file_hash'] = file_hash
+
             self.callback(alert)
             
         except Exception as e:
@@ -80,26 +146,42 @@ class FileSystemEventHandlerCustom(FileSystemEventHandler):
     
     def _should_ignore_file(self, file_path):
         """Check if file should be ignored"""
-        ignore_patterns = [
-            '.tmp', '.log', '.swp', '.swo', '~',
-            '.DS_Store', 'Thumbs.db', '.git/',
-            '__pycache__/', '.pyc', '.pyo'
-        ]
-        
-        file_lower = file_path.lower()
-        for pattern in ignore_patterns:
-            if pattern in file_lower:
-                return True
-        
-        return False
+        return _IGNORE_RE.search(file_path) is not None
     
     def _calculate_file_hash(self, file_path):
         """Calculate SHA-256 hash of file"""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
+            # Python 3.11+: the whole read-and-hash loop runs in C with the
+            # GIL released, so other monitor threads keep running
+            if _file_digest is not None:
+                with open(file_path, 'rb', buffering=0) as f:
+                    return _file_digest(f, _sha256_factory).hexdigest()
+
+            hash_sha256 = _sha256_factory()
+            with open(file_path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+
+                # Large files: map once and hash in a single C-level update
+                # (hashlib releases the GIL for the whole pass)
+                if size >= _HASH_CHUNK_SIZE:
+                    try:
+                        mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError):
+                        mapped = None
+                    if mapped is not None:
+                        with mapped:
+                            hash_sha256.update(mapped)
+                        return hash_sha256.hexdigest()
+
+                # Small or unmappable files: unbuffered reads into one reused
+                # buffer, no per-chunk bytes allocation
+                buffer = bytearray(_HASH_CHUNK_SIZE)
+                view = memoryview(buffer)
+                while True:
+                    bytes_read = f.readinto(buffer)
+                    if not bytes_read:
+                        break
+                    hash_sha256.update(view[:bytes_read])
             return hash_sha256.hexdigest()
         except Exception:
             return None
@@ -133,10 +215,25 @@ class FileSystemEventHandlerCustom(FileSystemEventHandler):
 class FileMonitor:
     def __init__(self, config):
         self.config = config
-        self.observer = None
+        # One observer per monitored directory: events in one tree never wake
+        # handlers scheduled for another
+        self.observers = []
         self.event_handler = None
         self.monitoring = False
-        
+        # hashlib releases the GIL during update(), so hashing several files
+        # in parallel threads scales across cores during event bursts
+        self._hash_pool = ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='sha256'
+        )
+        # Alerts flow through this queue to a dedicated dispatcher thread, so
+        # watcher threads never block on callback I/O (DB writes, email, ...)
+        self._alert_queue = None
+        self._dispatch_thread = None
+        # (path, inode, mtime_ns, size) -> digest LRU so repeated integrity
+        # scans of an unchanged tree skip re-reading the files
+        self._integrity_cache = OrderedDict()
+        self._integrity_cache_lock = threading.Lock()
+
     def update_config(self, config):
         """Update monitoring configuration"""
         self.config = config
@@ -153,34 +250,39 @@ class FileMonitor:
             return
         
         self.callback = callback
-        self.event_handler = FileSystemEventHandlerCustom(callback, self.config)
-        self.observer = Observer()
-        
-        # Monitor configured directories
+        self._alert_queue = queue.SimpleQueue()
+        self._dispatch_thread = threading.Thread(
+            target=self._dispatch_alerts, daemon=True, name='file-alerts'
+        )
+        self._dispatch_thread.start()
+
+        # Watchers enqueue; only the dispatcher thread ever runs the callback
+        self.event_handler = FileSystemEventHandlerCustom(
+            self._alert_queue.put, self.config, hash_pool=self._hash_pool
+        )
+
+        # Monitor configured directories, one observer shard per tree.
+        # Observer.schedule walks the tree and adds one kernel watch per
+        # subdirectory, so set the shards up in parallel: startup costs the
+        # largest tree instead of the sum of all of them
         monitored_dirs = self.config.get('monitored_dirs', [])
-        for directory in monitored_dirs:
-            if os.path.exists(directory):
-                try:
-                    self.observer.schedule(self.event_handler, directory, recursive=True)
-                except Exception as e:
-                    callback({
-                        'type': 'file',
-                        'severity': 'medium',
-                        'title': 'File Monitoring Setup Error',
-                        'message': f'Failed to monitor directory {directory}: {str(e)}'
-                    })
-        
+        existing_dirs = [d for d in monitored_dirs if os.path.exists(d)]
+        if existing_dirs:
+            with ThreadPoolExecutor(
+                max_workers=min(8, len(existing_dirs)), thread_name_prefix='watch-setup'
+            ) as setup_pool:
+                list(setup_pool.map(self._start_observer, existing_dirs))
+
         try:
-            self.observer.start()
             self.monitoring = True
-            
+
             callback({
                 'type': 'system',
                 'severity': 'low',
                 'title': 'File Monitoring Started',
                 'message': f'Monitoring {len(monitored_dirs)} directories for file changes'
             })
-            
+
         except Exception as e:
             callback({
                 'type': 'system',
@@ -188,14 +290,55 @@ class FileMonitor:
                 'title': 'File Monitoring Error',
                 'message': f'Failed to start file monitoring: {str(e)}'
             })
-    
+
+    def _start_observer(self, directory):
+        """Start a dedicated observer for one directory tree"""
+        try:
+            observer = Observer()
+            observer.schedule(self.event_handler, directory, recursive=True)
+            observer.start()
+            self.observers.append(observer)
+            return True
+        except Exception as e:
+            self._alert_queue.put({
+                'type': 'file',
+                'severity': 'medium',
+                'title': 'File Monitoring Setup Error',
+                'message': f'Failed to monitor directory {directory}: {str(e)}'
+            })
+            return False
+
+    def _dispatch_alerts(self):
+        """Drain queued alerts in batches and hand them to the callback"""
+        alert_queue = self._alert_queue
+        while True:
+            # Block for the first alert, then opportunistically batch up to
+            # 64 so bursts cost one wakeup instead of one per event
+            batch = [alert_queue.get()]
+            try:
+                while len(batch) < 64:
+                    batch.append(alert_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            for alert in batch:
+                if alert is None:
+                    return
+                try:
+                    self.callback(alert)
+                except Exception:
+                    continue
+
     def stop_monitoring(self):
         """Stop file system monitoring"""
-        if self.observer and self.monitoring:
-            self.observer.stop()
-            self.observer.join()
+        if self.observers and self.monitoring:
+            for observer in self.observers:
+                observer.stop()
+            for observer in self.observers:
+                observer.join()
+            self.observers = []
             self.monitoring = False
-            
+
             if hasattr(self, 'callback'):
                 self.callback({
                     'type': 'system',
@@ -203,35 +346,59 @@ class FileMonitor:
                     'title': 'File Monitoring Stopped',
                     'message': 'File system monitoring has been stopped'
                 })
+
+            # Sentinel shuts the dispatcher down after the queue drains
+            if self._dispatch_thread:
+                self._alert_queue.put(None)
+                self._dispatch_thread.join(timeout=5)
+                self._dispatch_thread = None
     
     def scan_file_integrity(self, file_path):
         """Scan a specific file for integrity"""
         try:
-            if not os.path.exists(file_path):
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
                 return {
                     'error': 'File not found',
                     'file_path': file_path
                 }
-            
-            # Calculate file hash
-            file_hash = self.event_handler._calculate_file_hash(file_path) if self.event_handler else None
-            file_size = os.path.getsize(file_path)
-            file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-            
+
+            # Stat identity: any content or metadata change produces a new key
+            cache_key = (file_path, stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+            with self._integrity_cache_lock:
+                file_hash = self._integrity_cache.get(cache_key)
+                if file_hash is not None:
+                    self._integrity_cache.move_to_end(cache_key)
+            cached = file_hash is not None
+
+            if file_hash is None:
+                file_hash = self.event_handler._calculate_file_hash(file_path) if self.event_handler else None
+                if file_hash is not None:
+                    with self._integrity_cache_lock:
+                        self._integrity_cache[cache_key] = file_hash
+                        if len(self._integrity_cache) > _INTEGRITY_CACHE_SIZE:
+                            self._integrity_cache.popitem(last=False)
+
             return {
                 'file_path': file_path,
-                'file_size': file_size,
+                'file_size': stat_result.st_size,
                 'file_hash': file_hash,
-                'modified_time': file_mtime,
-                'exists': True
+                'modified_time': datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+                'exists': True,
+                'cached': cached
             }
-            
+
         except Exception as e:
             return {
                 'error': str(e),
                 'file_path': file_path
             }
     
+    def scan_files_integrity(self, file_paths):
+        """Scan multiple files for integrity, hashing them in parallel"""
+        return list(self._hash_pool.map(self.scan_file_integrity, file_paths))
+
     def get_monitored_directories(self):
         """Get list of monitored directories"""
         return self.config.get('monitored_dirs', [])
@@ -244,13 +411,9 @@ class FileMonitor:
                 monitored_dirs.append(directory)
                 self.config['monitored_dirs'] = monitored_dirs
                 
-                # If monitoring is active, add the new directory
-                if self.monitoring and self.observer:
-                    try:
-                        self.observer.schedule(self.event_handler, directory, recursive=True)
-                        return True
-                    except Exception as e:
-                        return False
+                # If monitoring is active, shard out an observer for it
+                if self.monitoring and self.event_handler:
+                    return self._start_observer(directory)
                 return True
         return False
     
@@ -1,18 +1,80 @@
+import ipaddress
 import psutil
 import socket
 import threading
 import time
+from collections import deque
 from datetime import datetime
 import subprocess
 import platform
 
+# Connection classification tables, built once at import for O(1) lookups
+_SUSPICIOUS_PORTS = frozenset([
+    4444, 5555, 6666, 1234, 31337,  # Common backdoor ports
+    6667, 6668, 6669,  # IRC ports
+    25, 587, 465,  # SMTP ports (potential spam)
+])
+
+# Known malicious IP prefixes - simplified; in production, use threat
+# intelligence feeds. str.startswith takes the whole tuple in one C call.
+_SUSPICIOUS_PREFIXES = (
+    '10.0.0.',    # Example suspicious range
+    '192.168.1.', # Example suspicious range
+)
+
+# (mask, value) pairs for 10/8, 172.16/12, 192.168/16, 127/8 and
+# 169.254/16, checked against the packed 32-bit address on the IPv4 fast path
+_PRIVATE_V4_MASKS = (
+    (0xFF000000, 0x0A000000),
+    (0xFFF00000, 0xAC100000),
+    (0xFFFF0000, 0xC0A80000),
+    (0xFF000000, 0x7F000000),
+    (0xFFFF0000, 0xA9FE0000),
+)
+
+# How long a /proc/net snapshot stays fresh; within one tick every consumer
+# shares the same walk instead of re-reading the tables
+_SNAPSHOT_TTL = 1.0
+
 class NetworkMonitor:
     def __init__(self, config):
         self.config = config
         self.suspicious_connections = set()
+        # ip -> ring of the last 100 connection timestamps (epoch seconds)
         self.connection_history = {}
         self.lock = threading.Lock()
-        
+        # (monotonic timestamp, value) snapshots shared across methods
+        self._conn_snapshot = (0.0, None)
+        self._io_snapshot = (0.0, None)
+        self._snapshot_lock = threading.Lock()
+
+    def _get_connections(self):
+        """psutil.net_connections with a short shared snapshot window"""
+        now = time.monotonic()
+        with self._snapshot_lock:
+            taken, connections = self._conn_snapshot
+            if connections is not None and now - taken < _SNAPSHOT_TTL:
+                return connections
+
+        connections = psutil.net_connections(kind='inet')
+        with self._snapshot_lock:
+            self._conn_snapshot = (now, connections)
+        return connections
+
+    def _get_io_counters(self):
+        """psutil.net_io_counters with a short shared snapshot window"""
+        now = time.monotonic()
+        with self._snapshot_lock:
+            taken, counters = self._io_snapshot
+            if counters is not None and now - taken < _SNAPSHOT_TTL:
+                return counters
+
+        counters = psutil.net_io_counters()
+        with self._snapshot_lock:
+            self._io_snapshot = (now, counters)
+        return counters
+
+
     def update_config(self, config):
         """Update monitoring configuration"""
         self.config = config
@@ -22,25 +84,29 @@ class NetworkMonitor:
         alerts = []
         
         try:
-            connections = psutil.net_connections(kind='inet')
-            current_time = datetime.now()
-            
+            connections = self._get_connections()
+            now_ts = time.time()
+
+            # Loop invariants hoisted out of the per-connection path
+            monitored_ports = frozenset(self.config.get('monitored_ports', []))
+            suspicious_connections = self.suspicious_connections
+
             for conn in connections:
                 try:
                     if not conn.laddr:
                         continue
-                    
+
                     local_port = conn.laddr.port
                     remote_addr = conn.raddr.ip if conn.raddr else None
                     remote_port = conn.raddr.port if conn.raddr else None
                     status = conn.status
-                    
+
                     # Check for connections to monitored ports
-                    if local_port in self.config.get('monitored_ports', []):
+                    if local_port in monitored_ports:
                         connection_key = f"{remote_addr}:{remote_port}->{local_port}"
                         
-                        if connection_key not in self.suspicious_connections:
-                            self.suspicious_connections.add(connection_key)
+                        if connection_key not in suspicious_connections:
+                            suspicious_connections.add(connection_key)
                             alerts.append({
                                 'type': 'network',
                                 'severity': 'medium',
@@ -56,8 +122,8 @@ class NetworkMonitor:
                     if remote_addr and self._is_suspicious_connection(remote_addr, remote_port):
                         connection_key = f"{remote_addr}:{remote_port}"
                         
-                        if connection_key not in self.suspicious_connections:
-                            self.suspicious_connections.add(connection_key)
+                        if connection_key not in suspicious_connections:
+                            suspicious_connections.add(connection_key)
                             alerts.append({
                                 'type': 'network',
                                 'severity': 'high',
@@ -72,40 +138,32 @@ class NetworkMonitor:
                     # Track connection patterns
                     with self.lock:
                         if remote_addr:
-                            if remote_addr not in self.connection_history:
-                                self.connection_history[remote_addr] = []
-                            
-                            self.connection_history[remote_addr].append({
-                                'timestamp': current_time.isoformat(),
-                                'port': remote_port,
-                                'local_port': local_port,
-                                'status': status
-                            })
-                            
-                            # Keep only last 100 connections per IP
-                            self.connection_history[remote_addr] = self.connection_history[remote_addr][-100:]
-                            
+                            history = self.connection_history.get(remote_addr)
+                            if history is None:
+                                # Ring buffer: appending past maxlen drops the oldest entry
+                                history = self.connection_history[remote_addr] = deque(maxlen=100)
+
+                            history.append(now_ts)
+
                             # Check for connection flooding
-                            recent_connections = [
-                                c for c in self.connection_history[remote_addr]
-                                if (current_time - datetime.fromisoformat(c['timestamp'])).total_seconds() < 300
-                            ]
-                            
-                            if len(recent_connections) > 50:  # More than 50 connections in 5 minutes
+                            cutoff = now_ts - 300
+                            recent_connections = sum(1 for ts in history if ts >= cutoff)
+
+                            if recent_connections > 50:  # More than 50 connections in 5 minutes
                                 alerts.append({
                                     'type': 'network',
                                     'severity': 'high',
                                     'title': 'Connection Flooding Detected',
-                                    'message': f'Excessive connections from {remote_addr} ({len(recent_connections)} in 5 minutes)',
+                                    'message': f'Excessive connections from {remote_addr} ({recent_connections} in 5 minutes)',
                                     'remote_address': remote_addr,
-                                    'connection_count': len(recent_connections)
+                                    'connection_count': recent_connections
                                 })
                 
                 except Exception as e:
                     continue
             
             # Check network statistics for anomalies
-            network_stats = psutil.net_io_counters()
+            network_stats = self._get_io_counters()
             anomaly_alert = self._check_network_anomaly(network_stats)
             if anomaly_alert:
                 alerts.append(anomaly_alert)
@@ -123,39 +181,30 @@ class NetworkMonitor:
     def _is_suspicious_connection(self, remote_addr, remote_port):
         """Check if a connection is suspicious"""
         # Check for known suspicious ports
-        suspicious_ports = [
-            4444, 5555, 6666, 1234, 31337,  # Common backdoor ports
-            6667, 6668, 6669,  # IRC ports
-            25, 587, 465,  # SMTP ports (potential spam)
-        ]
-        
-        if remote_port in suspicious_ports:
+        if remote_port in _SUSPICIOUS_PORTS:
             return True
-        
+
         # Check for connections to private IP ranges from public IPs
         if self._is_private_ip(remote_addr):
             return False  # Private IPs are generally safe
-        
+
         # Check for connections to known malicious IP ranges
-        # This is a simplified check - in production, use threat intelligence feeds
-        suspicious_ranges = [
-            '10.0.0.',    # Example suspicious range
-            '192.168.1.', # Example suspicious range
-        ]
-        
-        for suspicious_range in suspicious_ranges:
-            if remote_addr.startswith(suspicious_range):
-                return True
-        
-        return False
+        return remote_addr.startswith(_SUSPICIOUS_PREFIXES)
     
     def _is_private_ip(self, ip):
         """Check if an IP address is in a private range"""
+        # IPv4 fast path: pack the dotted quad and test against bitmasks
+        # without allocating an ip_address object
+        try:
+            a, b, c, d = ip.split('.')
+            packed = (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+            return any((packed & mask) == value for mask, value in _PRIVATE_V4_MASKS)
+        except ValueError:
+            pass
+
         try:
-            import ipaddress
-            ip_obj = ipaddress.ip_address(ip)
-            return ip_obj.is_private
-        except:
+            return ipaddress.ip_address(ip).is_private
+        except ValueError:
             return False
     
     def _check_network_anomaly(self, current_stats):
@@ -183,7 +232,7 @@ class NetworkMonitor:
         connections = []
         
         try:
-            for conn in psutil.net_connections(kind='inet'):
+            for conn in self._get_connections():
                 if conn.laddr:
                     connections.append({
                         'local_address': conn.laddr.ip,
@@ -201,7 +250,7 @@ class NetworkMonitor:
     def get_network_stats(self):
         """Get network interface statistics"""
         try:
-            stats = psutil.net_io_counters()
+            stats = self._get_io_counters()
             return {
                 'bytes_sent': stats.bytes_sent,
                 'bytes_recv': stats.bytes_recv,
@@ -1,9 +1,25 @@
 import psutil
 import time
 import threading
+from collections import deque
 from datetime import datetime
 import platform
 import os
+import re
+
+# Suspicious process names / command-line fragments and temp-directory
+# locations, each compiled once into a single alternation so every process
+# costs one scan instead of one substring search per pattern
+_SUSPICIOUS_PATTERNS = [
+    'keylogger', 'rootkit', 'backdoor', 'trojan', 'malware',
+    'cryptominer', 'coinminer', 'bitcoin', 'monero',
+    'cmd.exe /c', 'powershell -enc', 'wscript', 'cscript',
+    'nc.exe', 'netcat', 'ncat'
+]
+_SUSPICIOUS_RE = re.compile('|'.join(map(re.escape, _SUSPICIOUS_PATTERNS)), re.IGNORECASE)
+
+_TEMP_DIRS = ['/tmp/', 'C:\\Temp\\', 'C:\\Windows\\Temp\\', '%TEMP%']
+_TEMP_RE = re.compile('|'.join(map(re.escape, _TEMP_DIRS)), re.IGNORECASE)
 
 class SystemMonitor:
     def __init__(self, config):
@@ -23,20 +39,26 @@ class SystemMonitor:
         try:
             current_processes = set()
             
+            whitelist = set(self.config.get('whitelist_processes', []))
+
+            # One batched snapshot per cycle: every field comes from proc.info,
+            # so psutil reads /proc/<pid>/* once per process with no extra
+            # per-pid calls (cpu_percent is the non-blocking delta since the
+            # previous cycle)
             for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'cmdline']):
                 try:
                     pinfo = proc.info
                     pid = pinfo['pid']
                     name = pinfo['name']
-                    
+
                     current_processes.add(pid)
-                    
+
                     # Skip whitelisted processes
-                    if name in self.config.get('whitelist_processes', []):
+                    if name in whitelist:
                         continue
-                    
+
                     # Check CPU usage
-                    cpu_percent = proc.cpu_percent(interval=0.1)
+                    cpu_percent = pinfo['cpu_percent'] or 0.0
                     if cpu_percent > self.config.get('process_cpu_threshold', 80.0):
                         alerts.append({
                             'type': 'process',
@@ -80,18 +102,15 @@ class SystemMonitor:
                         if pid not in self.process_stats:
                             self.process_stats[pid] = {
                                 'name': name,
-                                'cpu_history': [],
-                                'memory_history': []
+                                # Rings keep the last 10 samples without re-slicing
+                                'cpu_history': deque(maxlen=10),
+                                'memory_history': deque(maxlen=10)
                             }
-                        
+
                         stats = self.process_stats[pid]
                         stats['cpu_history'].append(cpu_percent)
                         stats['memory_history'].append(memory_mb)
-                        
-                        # Keep only last 10 measurements
-                        stats['cpu_history'] = stats['cpu_history'][-10:]
-                        stats['memory_history'] = stats['memory_history'][-10:]
-                        
+
                         # Check for anomalies
                         anomaly_alert = self._check_process_anomaly(pid, stats)
                         if anomaly_alert:
@@ -121,40 +140,34 @@ class SystemMonitor:
     
     def _is_suspicious_process(self, name, cmdline):
         """Check if a process name or command line is suspicious"""
-        suspicious_patterns = [
-            'keylogger', 'rootkit', 'backdoor', 'trojan', 'malware',
-            'cryptominer', 'coinminer', 'bitcoin', 'monero',
-            'cmd.exe /c', 'powershell -enc', 'wscript', 'cscript',
-            'nc.exe', 'netcat', 'ncat'
-        ]
-        
-        name_lower = name.lower()
-        cmdline_str = ' '.join(cmdline).lower()
-        
-        for pattern in suspicious_patterns:
-            if pattern in name_lower or pattern in cmdline_str:
-                return True
-        
-        # Check for processes running from temp directories
-        temp_dirs = ['/tmp/', 'C:\\Temp\\', 'C:\\Windows\\Temp\\', '%TEMP%']
-        for temp_dir in temp_dirs:
-            if temp_dir.lower() in cmdline_str:
-                return True
-        
-        return False
+        if _SUSPICIOUS_RE.search(name):
+            return True
+
+        if not cmdline:
+            return False
+
+        cmdline_str = ' '.join(cmdline)
+        return bool(_SUSPICIOUS_RE.search(cmdline_str) or _TEMP_RE.search(cmdline_str))
     
     def _check_process_anomaly(self, pid, stats):
         """Check for anomalous process behavior"""
-        if len(stats['cpu_history']) < 5:
+        cpu_history = stats['cpu_history']
+        if len(cpu_history) < 5:
             return None
-        
-        # Calculate average and recent usage
-        avg_cpu = sum(stats['cpu_history'][:-2]) / (len(stats['cpu_history']) - 2)
-        recent_cpu = sum(stats['cpu_history'][-2:]) / 2
-        
-        avg_memory = sum(stats['memory_history'][:-2]) / (len(stats['memory_history']) - 2)
-        recent_memory = sum(stats['memory_history'][-2:]) / 2
-        
+
+        # Compare the last two samples against the preceding baseline without
+        # materializing slice copies of the rings
+        memory_history = stats['memory_history']
+        baseline_len = len(cpu_history) - 2
+
+        cpu_total = sum(cpu_history)
+        recent_cpu = (cpu_history[-1] + cpu_history[-2]) / 2
+        avg_cpu = (cpu_total - cpu_history[-1] - cpu_history[-2]) / baseline_len
+
+        memory_total = sum(memory_history)
+        recent_memory = (memory_history[-1] + memory_history[-2]) / 2
+        avg_memory = (memory_total - memory_history[-1] - memory_history[-2]) / baseline_len
+
         # Check for sudden spikes
         cpu_spike = recent_cpu > avg_cpu * 2 and recent_cpu > 50
         memory_spike = recent_memory > avg_memory * 2 and recent_memory > 100
@@ -195,13 +208,16 @@ class SystemMonitor:
         processes = []
         
         try:
+            # The attrs snapshot already carries the non-blocking since-last-
+            # sample cpu_percent; the old per-process interval=0.1 call slept
+            # 100 ms for every process on the box
             for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'status']):
                 try:
                     pinfo = proc.info
                     processes.append({
                         'pid': pinfo['pid'],
                         'name': pinfo['name'],
-                        'cpu_percent': proc.cpu_percent(interval=0.1),
+                        'cpu_percent': pinfo['cpu_percent'] or 0.0,
                         'memory_mb': pinfo['memory_info'].rss / (1024 * 1024),
                         'status': pinfo['status']
                     })
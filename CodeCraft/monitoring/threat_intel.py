@@ -1,15 +1,94 @@
 import os
 import hashlib
+import mmap
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
+import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Bind directly to OpenSSL's SHA-256, which picks its SHA-NI assembly path
+# at runtime; feeding it whole-file buffers keeps it in that tight loop
+try:
+    from _hashlib import openssl_sha256 as _sha256_factory
+except ImportError:
+    _sha256_factory = hashlib.sha256
+
+# Python 3.11+: runs the whole read-and-hash loop in C on a large internal
+# buffer instead of one Python iteration per chunk
+_file_digest = getattr(hashlib, 'file_digest', None)
+
+# 1 MiB fallback chunks: large enough that syscall and interpreter overhead
+# vanish, and hashlib releases the GIL during each update()
+_HASH_CHUNK_SIZE = 1 << 20
+
+# In-memory result cache bound; the SQLite store below it holds the rest
+_RESULT_CACHE_SIZE = 4096
+_CACHE_DB = 'ti_cache.db'
+
+class _RateLimiter:
+    """Sliding-window limiter that spaces calls under a provider quota.
+
+    Blocking here is cheaper than firing the request: an over-quota call
+    comes back 204/429 and its work is simply thrown away.
+    """
+    def __init__(self, max_calls, period):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
 
 class ThreatIntelligence:
     def __init__(self, config):
         self.config = config
-        self.cache = {}
+        # Bounded LRU in front of a SQLite store: provider lookups are
+        # rate-limited, so results must cap memory and survive restarts
+        self.cache = OrderedDict()
         self.cache_timeout = 3600  # 1 hour cache
+        self._cache_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(_CACHE_DB, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS scan_cache ('
+                'hash TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.commit()
+        except sqlite3.Error:
+            self._db = None
+        # path -> (size, mtime_ns, inode, hash): unchanged files skip SHA-256
+        self.stat_cache = {}
+        self._stat_lock = threading.Lock()
+        # VirusTotal and OTX lookups are latency-bound; run them in parallel
+        self._lookup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='intel')
+        # Keep-alive session: repeat calls to the same provider reuse the
+        # pooled TLS connection instead of handshaking every request
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10, pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+        # Free-tier quotas: VirusTotal allows 4 req/min, OTX is generous but
+        # capped defensively at 10 req/min
+        self._vt_limiter = _RateLimiter(4, 60.0)
+        self._otx_limiter = _RateLimiter(10, 60.0)
         
     def update_config(self, config):
         """Update threat intelligence configuration"""
@@ -18,16 +97,27 @@ class ThreatIntelligence:
     def scan_file(self, file_path):
         """Scan file using threat intelligence services"""
         try:
-            if not os.path.exists(file_path):
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
                 return {'error': 'File not found', 'file_path': file_path}
-            
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(file_path)
-            if not file_hash:
-                return {'error': 'Could not calculate file hash', 'file_path': file_path}
-            
-            file_size = os.path.getsize(file_path)
-            
+
+            # Hashing dominates scan latency; if the stat identity matches the
+            # last scan of this path, reuse that digest instead of re-reading
+            stat_key = (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+            with self._stat_lock:
+                cached_stat = self.stat_cache.get(file_path)
+            if cached_stat is not None and cached_stat[:3] == stat_key:
+                file_hash = cached_stat[3]
+            else:
+                file_hash = self._calculate_file_hash(file_path)
+                if not file_hash:
+                    return {'error': 'Could not calculate file hash', 'file_path': file_path}
+                with self._stat_lock:
+                    self.stat_cache[file_path] = stat_key + (file_hash,)
+
+            file_size = stat_result.st_size
+
             result = {
                 'file_path': file_path,
                 'file_size': file_size,
@@ -40,15 +130,19 @@ class ThreatIntelligence:
             }
             
             # Check cache first
-            if file_hash in self.cache:
-                cache_entry = self.cache[file_hash]
-                if datetime.now() - datetime.fromisoformat(cache_entry['timestamp']) < timedelta(seconds=self.cache_timeout):
-                    result.update(cache_entry['data'])
-                    result['from_cache'] = True
-                    return result
-            
-            # Scan with VirusTotal
-            vt_result = self._scan_with_virustotal(file_hash)
+            cached_data = self._cache_get(file_hash)
+            if cached_data is not None:
+                result.update(cached_data)
+                result['from_cache'] = True
+                return result
+
+            # Scan with VirusTotal and OTX concurrently; each is a blocking
+            # HTTP round trip, so the pair costs max() instead of sum()
+            vt_future = self._lookup_pool.submit(self._scan_with_virustotal, file_hash)
+            otx_future = self._lookup_pool.submit(self._scan_with_otx, file_hash)
+            vt_result = vt_future.result()
+            otx_result = otx_future.result()
+
             if vt_result:
                 result['virustotal_result'] = vt_result
                 if vt_result.get('malicious', 0) > 0:
@@ -56,35 +150,110 @@ class ThreatIntelligence:
                 elif vt_result.get('suspicious', 0) > 0:
                     result['suspicious'] = True
             
-            # Scan with OTX
-            otx_result = self._scan_with_otx(file_hash)
             if otx_result:
                 result['otx_result'] = otx_result
                 if otx_result.get('threat_found'):
                     result['is_malware'] = True
             
             # Cache the result
-            self.cache[file_hash] = {
-                'timestamp': datetime.now().isoformat(),
-                'data': {
-                    'virustotal_result': result['virustotal_result'],
-                    'otx_result': result['otx_result'],
-                    'is_malware': result['is_malware'],
-                    'suspicious': result['suspicious']
-                }
-            }
-            
+            self._cache_put(file_hash, {
+                'virustotal_result': result['virustotal_result'],
+                'otx_result': result['otx_result'],
+                'is_malware': result['is_malware'],
+                'suspicious': result['suspicious']
+            })
+
             return result
-            
+
         except Exception as e:
             return {'error': str(e), 'file_path': file_path}
-    
+
+    def scan_paths(self, file_paths, max_workers=None):
+        """Scan multiple files, hashing them concurrently.
+
+        hashlib releases the GIL while digesting, so worker threads overlap
+        both the disk reads and the SHA-256 compute across cores.
+        """
+        if not file_paths:
+            return []
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scan') as executor:
+            return list(executor.map(self.scan_file, file_paths))
+
+    def _cache_get(self, file_hash):
+        """Look up a fresh scan result, memory first, then the SQLite store"""
+        with self._cache_lock:
+            cache_entry = self.cache.get(file_hash)
+            if cache_entry is not None:
+                # Plain float comparison: no datetime parsing on the hot path
+                if time.monotonic() - cache_entry['timestamp'] < self.cache_timeout:
+                    self.cache.move_to_end(file_hash)
+                    return cache_entry['data']
+                del self.cache[file_hash]
+
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT data, expires_at FROM scan_cache WHERE hash = ?', (file_hash,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or row[1] <= time.time():
+            return None
+
+        # Promote the persisted entry so repeat hits stay in memory
+        data = json.loads(row[0])
+        self._remember(file_hash, data)
+        return data
+
+    def _cache_put(self, file_hash, data):
+        """Store a scan result in memory and in the persistent store"""
+        self._remember(file_hash, data)
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO scan_cache (hash, data, expires_at) VALUES (?, ?, ?)',
+                        (file_hash, json.dumps(data), time.time() + self.cache_timeout)
+                    )
+                    self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _remember(self, file_hash, data):
+        with self._cache_lock:
+            self.cache[file_hash] = {
+                'timestamp': time.monotonic(),
+                'data': data
+            }
+            self.cache.move_to_end(file_hash)
+            while len(self.cache) > _RESULT_CACHE_SIZE:
+                self.cache.popitem(last=False)
+
     def _calculate_file_hash(self, file_path):
         """Calculate SHA-256 hash of file"""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+            if _file_digest is not None:
+                with open(file_path, 'rb', buffering=0) as f:
+                    return _file_digest(f, _sha256_factory).hexdigest()
+
+            hash_sha256 = _sha256_factory()
+            with open(file_path, 'rb', buffering=0) as f:
+                # Map the file and digest it in one update so OpenSSL never
+                # has to return to Python between blocks
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    try:
+                        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+                            hash_sha256.update(mapped)
+                        return hash_sha256.hexdigest()
+                    except (OSError, ValueError):
+                        pass
+
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
                     hash_sha256.update(chunk)
             return hash_sha256.hexdigest()
         except Exception:
@@ -103,7 +272,8 @@ class ThreatIntelligence:
                 'resource': file_hash
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            self._vt_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -136,7 +306,8 @@ class ThreatIntelligence:
                 'X-OTX-API-KEY': api_key
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            self._otx_limiter.acquire()
+            response = self.session.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -166,16 +337,18 @@ class ThreatIntelligence:
                 'sources': {}
             }
             
-            # Check with VirusTotal
-            vt_result = self._check_ip_virustotal(ip_address)
+            # Both reputation sources in parallel, same as scan_file
+            vt_future = self._lookup_pool.submit(self._check_ip_virustotal, ip_address)
+            otx_future = self._lookup_pool.submit(self._check_ip_otx, ip_address)
+            vt_result = vt_future.result()
+            otx_result = otx_future.result()
+
             if vt_result:
                 result['sources']['virustotal'] = vt_result
                 if vt_result.get('malicious', 0) > 0:
                     result['is_malicious'] = True
                     result['reputation_score'] += 50
             
-            # Check with OTX
-            otx_result = self._check_ip_otx(ip_address)
             if otx_result:
                 result['sources']['otx'] = otx_result
                 if otx_result.get('threat_found'):
@@ -200,7 +373,8 @@ class ThreatIntelligence:
                 'ip': ip_address
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            self._vt_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -233,7 +407,8 @@ class ThreatIntelligence:
                 'X-OTX-API-KEY': api_key
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            self._otx_limiter.acquire()
+            response = self.session.get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -279,7 +454,8 @@ class ThreatIntelligence:
                 'limit': 10
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            self._otx_limiter.acquire()
+            response = self.session.get(url, headers=headers, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -304,4 +480,14 @@ class ThreatIntelligence:
     
     def clear_cache(self):
         """Clear threat intelligence cache"""
-        self.cache.clear()
+        with self._cache_lock:
+            self.cache.clear()
+        with self._stat_lock:
+            self.stat_cache.clear()
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.execute('DELETE FROM scan_cache')
+                    self._db.commit()
+            except sqlite3.Error:
+                pass
@@ -1,12 +1,31 @@
 import os
 import base64
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Headers marking AES-GCM encrypted files; anything without one is treated
+# as a legacy Fernet blob. v1 is one-shot, v2 is the framed streaming format
+_FILE_MAGIC = b'SWPGCM1\x00'
+_FILE_MAGIC_STREAM = b'SWPGCM2\x00'
+_NONCE_SIZE = 12
+# 8 random bytes per file keeps the nonce-collision birthday bound at ~2^32
+# files under one key; the remaining 4 counter bytes still allow 2^32 frames
+# (4 PiB) per file
+_NONCE_PREFIX_SIZE = 8
+_NONCE_COUNTER_SIZE = _NONCE_SIZE - _NONCE_PREFIX_SIZE
+_CHUNK_SIZE = 1 << 20
+
+# Per-frame type byte, written to the file and fed to AES-GCM as AAD so a
+# frame cannot be re-labelled. Every stream ends with an authenticated empty
+# final frame; a file cut off before it fails to decrypt.
+_FRAME_DATA = b'\x01'
+_FRAME_FINAL = b'\x00'
 
 class EncryptionManager:
     def __init__(self, key_file='encryption.key'):
         self.key_file = key_file
         self.cipher = self._load_or_generate_key()
-    
+
     def _load_or_generate_key(self):
         """Load existing key or generate a new one"""
         if os.path.exists(self.key_file):
@@ -16,23 +35,31 @@ class EncryptionManager:
             key = Fernet.generate_key()
             with open(self.key_file, 'wb') as f:
                 f.write(key)
-        
+
+        # The decoded Fernet key is 32 bytes; reusing it as an AES-256-GCM
+        # key gives single-pass AES-NI + GHASH bulk file encryption while
+        # Fernet keeps handling the short config strings
+        self.aead = AESGCM(base64.urlsafe_b64decode(key))
         return Fernet(key)
     
     def encrypt(self, data):
-        """Encrypt data and return base64 encoded string"""
+        """Encrypt data and return the token as a string"""
         if isinstance(data, str):
             data = data.encode('utf-8')
-        
-        encrypted_data = self.cipher.encrypt(data)
-        return base64.b64encode(encrypted_data).decode('utf-8')
-    
+
+        # Fernet tokens are already urlsafe base64; wrapping them in a
+        # second b64encode just grew them 33% and cost an extra pass
+        return self.cipher.encrypt(data).decode('ascii')
+
     def decrypt(self, encrypted_data):
-        """Decrypt base64 encoded string and return original data"""
+        """Decrypt an encrypted string and return original data"""
         try:
-            encrypted_bytes = base64.b64decode(encrypted_data.encode('utf-8'))
-            decrypted_data = self.cipher.decrypt(encrypted_bytes)
-            return decrypted_data.decode('utf-8')
+            token = encrypted_data.encode('ascii')
+            try:
+                return self.cipher.decrypt(token).decode('utf-8')
+            except Exception:
+                # Values written before the double-base64 layer was removed
+                return self.cipher.decrypt(base64.b64decode(token)).decode('utf-8')
         except Exception as e:
             raise ValueError(f"Decryption failed: {str(e)}")
     
@@ -41,29 +68,83 @@ class EncryptionManager:
         if output_path is None:
             output_path = file_path + '.encrypted'
         
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-        
-        encrypted_data = self.cipher.encrypt(file_data)
-        
-        with open(output_path, 'wb') as f:
-            f.write(encrypted_data)
-        
+        # Stream 1 MiB frames so peak memory stays constant regardless of
+        # file size; each frame is sealed with nonce = random prefix ||
+        # frame counter, so reordering frames fails to decrypt, and the
+        # authenticated final frame makes truncation detectable
+        nonce_prefix = os.urandom(_NONCE_PREFIX_SIZE)
+        with open(file_path, 'rb') as src, open(output_path, 'wb') as dst:
+            dst.write(_FILE_MAGIC_STREAM)
+            dst.write(nonce_prefix)
+
+            counter = 0
+            while True:
+                chunk = src.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                nonce = nonce_prefix + counter.to_bytes(_NONCE_COUNTER_SIZE, 'big')
+                frame = self.aead.encrypt(nonce, chunk, _FRAME_DATA)
+                dst.write(_FRAME_DATA)
+                dst.write(len(frame).to_bytes(4, 'big'))
+                dst.write(frame)
+                counter += 1
+
+            nonce = nonce_prefix + counter.to_bytes(_NONCE_COUNTER_SIZE, 'big')
+            frame = self.aead.encrypt(nonce, b'', _FRAME_FINAL)
+            dst.write(_FRAME_FINAL)
+            dst.write(len(frame).to_bytes(4, 'big'))
+            dst.write(frame)
+
         return output_path
-    
+
     def decrypt_file(self, encrypted_file_path, output_path=None):
         """Decrypt a file"""
         if output_path is None:
             output_path = encrypted_file_path.replace('.encrypted', '')
-        
-        with open(encrypted_file_path, 'rb') as f:
-            encrypted_data = f.read()
-        
-        decrypted_data = self.cipher.decrypt(encrypted_data)
-        
+
+        with open(encrypted_file_path, 'rb') as src:
+            header = src.read(len(_FILE_MAGIC_STREAM))
+
+            if header == _FILE_MAGIC_STREAM:
+                nonce_prefix = src.read(_NONCE_PREFIX_SIZE)
+                if len(nonce_prefix) != _NONCE_PREFIX_SIZE:
+                    raise ValueError("Encrypted file is truncated")
+                with open(output_path, 'wb') as dst:
+                    counter = 0
+                    while True:
+                        frame_type = src.read(1)
+                        frame_size = src.read(4)
+                        if len(frame_type) != 1 or len(frame_size) != 4:
+                            # EOF without an authenticated final frame
+                            raise ValueError("Encrypted file is truncated")
+                        size = int.from_bytes(frame_size, 'big')
+                        frame = src.read(size)
+                        if len(frame) != size:
+                            raise ValueError("Encrypted file is truncated")
+                        nonce = nonce_prefix + counter.to_bytes(_NONCE_COUNTER_SIZE, 'big')
+                        chunk = self.aead.decrypt(nonce, frame, frame_type)
+                        if frame_type == _FRAME_FINAL:
+                            if src.read(1):
+                                raise ValueError("Trailing data after final frame")
+                            break
+                        dst.write(chunk)
+                        counter += 1
+                return output_path
+
+            encrypted_data = header + src.read()
+
+        if encrypted_data.startswith(_FILE_MAGIC):
+            # One-shot AES-GCM container
+            nonce_end = len(_FILE_MAGIC) + _NONCE_SIZE
+            nonce = encrypted_data[len(_FILE_MAGIC):nonce_end]
+            decrypted_data = self.aead.decrypt(nonce, encrypted_data[nonce_end:], None)
+        else:
+            # Files written before the AES-GCM containers
+            decrypted_data = self.cipher.decrypt(encrypted_data)
+
         with open(output_path, 'wb') as f:
             f.write(decrypted_data)
-        
+
         return output_path
     
     def generate_new_key(self):
@@ -71,6 +152,7 @@ class EncryptionManager:
         key = Fernet.generate_key()
         with open(self.key_file, 'wb') as f:
             f.write(key)
-        
+
         self.cipher = Fernet(key)
+        self.aead = AESGCM(base64.urlsafe_b64decode(key))
         return key
@@ -0,0 +1,45 @@
+import json as _stdlib_json
+
+# orjson is 2-5x faster than stdlib json and handles datetime/numpy natively;
+# fall back to stdlib when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj, **kwargs):
+        """Serialize to a JSON string (kwargs accepted for stdlib compatibility)"""
+        return orjson.dumps(obj, default=str, option=_OPTIONS).decode('utf-8')
+
+    def loads(data, **kwargs):
+        """Deserialize JSON from str or bytes"""
+        return orjson.loads(data)
+else:
+    def dumps(obj, **kwargs):
+        """Serialize to a JSON string"""
+        kwargs.setdefault('default', str)
+        return _stdlib_json.dumps(obj, **kwargs)
+
+    def loads(data, **kwargs):
+        """Deserialize JSON from str or bytes"""
+        return _stdlib_json.loads(data, **kwargs)
+
+try:
+    from flask.json.provider import JSONProvider
+except ImportError:
+    JSONProvider = None
+
+if JSONProvider is not None:
+    class FastJSONProvider(JSONProvider):
+        """Flask JSON provider backed by orjson (used by jsonify and request.json)"""
+
+        def dumps(self, obj, **kwargs):
+            return dumps(obj, **kwargs)
+
+        def loads(self, s, **kwargs):
+            return loads(s, **kwargs)
+else:
+    FastJSONProvider = None
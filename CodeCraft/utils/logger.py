@@ -1,13 +1,63 @@
 import os
 import logging
 import json
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps_text(obj):
+        return orjson.dumps(obj, default=str).decode('utf-8')
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_text(obj):
+        return json.dumps(obj, default=str)
+
+# Rotate the JSON alert log at this size, keeping one previous generation
+_ALERT_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+# Hour buckets kept for in-memory summaries (one week)
+_MAX_SUMMARY_HOURS = 24 * 7
+
+def _looks_like_stamp(prefix):
+    """Cheap shape check for a b'YYYY-MM-DD HH:MM:SS' line prefix"""
+    return (
+        len(prefix) == 19
+        and prefix[4:5] == b'-' and prefix[7:8] == b'-'
+        and prefix[13:14] == b':' and prefix[16:17] == b':'
+        and prefix[:4].isdigit()
+    )
 
 class SecurityLogger:
     def __init__(self, log_dir='logs'):
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
+
+        self._alert_log_path = os.path.join(log_dir, 'alerts.json')
+        self._alert_log = None  # opened lazily, append-binary
+        # Serializes write + size check + rotation; log_alert is reachable
+        # from both the monitoring worker and the file-monitor dispatcher
+        self._alert_io_lock = threading.Lock()
+
+        # epoch-hour -> severity/type tallies, maintained on every write so
+        # summaries don't have to re-read the log
+        self._hour_counts = {}
+        self._counts_since = time.time()
+        self._counts_lock = threading.Lock()
+        self._backfilled = False
+        # Held across the whole backfill so concurrent first summaries
+        # cannot both fold the old records in and double-count them
+        self._backfill_lock = threading.Lock()
         
         # Setup main logger
         self.logger = logging.getLogger('sentinelwatch')
@@ -19,12 +69,18 @@ class SecurityLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
-        # Setup file handlers
-        self._setup_file_handlers()
-        
-        # Setup console handler
-        self._setup_console_handler()
-    
+        # The logger itself only enqueues; a listener thread owns the real
+        # handlers, so callers on monitoring hot paths never wait on disk
+        handlers = self._setup_file_handlers()
+        handlers.append(self._setup_console_handler())
+
+        self._log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(self._log_queue))
+        self._listener = QueueListener(
+            self._log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+
     def _setup_file_handlers(self):
         """Setup rotating file handlers for different log types"""
         # Main log file
@@ -34,8 +90,7 @@ class SecurityLogger:
         )
         main_handler.setLevel(logging.INFO)
         main_handler.setFormatter(self.formatter)
-        self.logger.addHandler(main_handler)
-        
+
         # Alert log file
         alert_log_file = os.path.join(self.log_dir, 'alerts.log')
         self.alert_handler = RotatingFileHandler(
@@ -43,7 +98,7 @@ class SecurityLogger:
         )
         self.alert_handler.setLevel(logging.WARNING)
         self.alert_handler.setFormatter(self.formatter)
-        
+
         # Error log file
         error_log_file = os.path.join(self.log_dir, 'errors.log')
         self.error_handler = RotatingFileHandler(
@@ -51,14 +106,15 @@ class SecurityLogger:
         )
         self.error_handler.setLevel(logging.ERROR)
         self.error_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.error_handler)
-    
+
+        return [main_handler, self.error_handler]
+
     def _setup_console_handler(self):
         """Setup console handler for important messages"""
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.WARNING)
         console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(console_handler)
+        return console_handler
     
     def log_info(self, message):
         """Log informational message"""
@@ -87,24 +143,87 @@ class SecurityLogger:
         # Log to alert file with JSON format
         alert_entry = {
             'timestamp': alert.get('timestamp', datetime.now().isoformat()),
+            # Float epoch alongside the ISO string so readers can filter by
+            # age without parsing a datetime per record
+            'ts': time.time(),
             'type': alert.get('type', 'unknown'),
             'severity': alert.get('severity', 'unknown'),
             'title': alert.get('title', 'Security Alert'),
             'message': alert.get('message', ''),
             'details': {k: v for k, v in alert.items() if k not in ['timestamp', 'type', 'severity', 'title', 'message']}
         }
-        
+
         try:
-            with open(os.path.join(self.log_dir, 'alerts.json'), 'a') as f:
-                f.write(json.dumps(alert_entry) + '\n')
+            if orjson is not None:
+                line = orjson.dumps(alert_entry, default=str) + b'\n'
+            else:
+                line = (json.dumps(alert_entry, default=str) + '\n').encode('utf-8')
+
+            with self._alert_io_lock:
+                log_file = self._alert_log_file()
+                log_file.write(line)
+                log_file.flush()
+                if log_file.tell() > _ALERT_LOG_MAX_BYTES:
+                    self._rotate_alert_log()
+
+            self._count_alert(alert_entry['ts'], alert_entry['severity'], alert_entry['type'])
         except Exception as e:
             self.logger.error(f"Failed to write alert to JSON log: {e}")
+
+    def _count_alert(self, ts, severity, alert_type):
+        """Fold one alert into the hour-bucket tallies"""
+        bucket = int(ts // 3600)
+        with self._counts_lock:
+            counts = self._hour_counts.get(bucket)
+            if counts is None:
+                counts = self._hour_counts[bucket] = {
+                    'total': 0, 'high': 0, 'medium': 0, 'low': 0, 'by_type': {}
+                }
+                # A new hour started; drop buckets beyond the retention window
+                horizon = bucket - _MAX_SUMMARY_HOURS
+                for old_bucket in [b for b in self._hour_counts if b < horizon]:
+                    del self._hour_counts[old_bucket]
+
+            counts['total'] += 1
+            if severity in counts:
+                counts[severity] += 1
+            by_type = counts['by_type']
+            by_type[alert_type] = by_type.get(alert_type, 0) + 1
+
+    def _alert_log_file(self):
+        """Persistent append-binary handle for the JSON alert log.
+
+        Callers hold _alert_io_lock. The handle is revalidated against the
+        path so that cleanup_old_logs (or an external rotation) unlinking
+        alerts.json does not leave writes going to the dead inode.
+        """
+        if self._alert_log is not None and not self._alert_log.closed:
+            try:
+                if os.path.samestat(
+                    os.fstat(self._alert_log.fileno()),
+                    os.stat(self._alert_log_path),
+                ):
+                    return self._alert_log
+            except OSError:
+                pass  # path missing or handle unusable; reopen below
+            self._alert_log.close()
+        self._alert_log = open(self._alert_log_path, 'ab')
+        return self._alert_log
+
+    def _rotate_alert_log(self):
+        """Roll alerts.json to alerts.json.1, replacing the old generation.
+
+        Callers hold _alert_io_lock.
+        """
+        self._alert_log.close()
+        self._alert_log = None
+        os.replace(self._alert_log_path, self._alert_log_path + '.1')
     
     def log_system_event(self, event_type, message, details=None):
         """Log system event"""
         event_message = f"SYSTEM - {event_type}: {message}"
         if details:
-            event_message += f" - Details: {json.dumps(details)}"
+            event_message += f" - Details: {_json_dumps_text(details)}"
         
         self.logger.info(event_message)
     
@@ -121,30 +240,59 @@ class SecurityLogger:
             
             if not os.path.exists(log_file):
                 return []
-            
-            with open(log_file, 'r') as f:
-                all_lines = f.readlines()
-                return [line.strip() for line in all_lines[-lines:]]
-        
+
+            return self._tail_lines(log_file, lines)
+
         except Exception as e:
             self.logger.error(f"Failed to read log file: {e}")
             return [f"Error reading logs: {str(e)}"]
+
+    def _tail_lines(self, log_file, line_count):
+        """Read the last line_count lines by scanning backward in blocks.
+
+        Costs O(lines read) instead of loading the whole file, which
+        matters once the log sits near its rotation cap.
+        """
+        block_size = 64 * 1024
+        with open(log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            blocks = []
+            newlines = 0
+            while pos > 0 and newlines <= line_count:
+                read_size = min(block_size, pos)
+                pos -= read_size
+                f.seek(pos)
+                block = f.read(read_size)
+                blocks.append(block)
+                newlines += block.count(b'\n')
+
+        data = b''.join(reversed(blocks))
+        return [
+            line.decode('utf-8', errors='replace').strip()
+            for line in data.splitlines()[-line_count:]
+        ]
     
     def get_alerts_summary(self, hours=24):
         """Get summary of alerts from the last N hours"""
         try:
+            cutoff_ts = time.time() - hours * 3600
+
+            # Windows inside the bucket retention are answered from memory;
+            # records from earlier runs are folded in once, on first need
+            if hours <= _MAX_SUMMARY_HOURS:
+                if cutoff_ts < self._counts_since and not self._backfilled:
+                    # Double-checked: a separate once-lock, because
+                    # _backfill_counts takes _counts_lock per record
+                    with self._backfill_lock:
+                        if not self._backfilled:
+                            self._backfill_counts()
+                if self._backfilled or cutoff_ts >= self._counts_since:
+                    return self._summary_from_counts(cutoff_ts)
+
             cutoff_time = datetime.now() - timedelta(hours=hours)
             alerts_file = os.path.join(self.log_dir, 'alerts.json')
-            
-            if not os.path.exists(alerts_file):
-                return {
-                    'total': 0,
-                    'high': 0,
-                    'medium': 0,
-                    'low': 0,
-                    'by_type': {}
-                }
-            
+
             summary = {
                 'total': 0,
                 'high': 0,
@@ -152,52 +300,110 @@ class SecurityLogger:
                 'low': 0,
                 'by_type': {}
             }
-            
+
+            if not os.path.exists(alerts_file):
+                return summary
+
             with open(alerts_file, 'r') as f:
                 for line in f:
                     try:
-                        alert = json.loads(line.strip())
-                        alert_time = datetime.fromisoformat(alert['timestamp'])
-                        
-                        if alert_time >= cutoff_time:
+                        alert = _json_loads(line)
+
+                        # Records carry a float epoch; only old lines need
+                        # the datetime parse
+                        ts = alert.get('ts')
+                        if ts is not None:
+                            recent = ts >= cutoff_ts
+                        else:
+                            recent = datetime.fromisoformat(alert['timestamp']) >= cutoff_time
+
+                        if recent:
                             summary['total'] += 1
-                            
+
                             severity = alert.get('severity', 'unknown')
                             if severity in summary:
                                 summary[severity] += 1
-                            
+
                             alert_type = alert.get('type', 'unknown')
                             if alert_type not in summary['by_type']:
                                 summary['by_type'][alert_type] = 0
                             summary['by_type'][alert_type] += 1
-                    
-                    except (json.JSONDecodeError, ValueError, KeyError):
+
+                    except (ValueError, KeyError):
                         continue
-            
+
             return summary
-        
+
         except Exception as e:
             self.logger.error(f"Failed to generate alerts summary: {e}")
             return {'error': str(e)}
+
+    def _backfill_counts(self):
+        """Fold alerts written by earlier runs into the hour buckets (once)"""
+        horizon = time.time() - _MAX_SUMMARY_HOURS * 3600
+        for path in (self._alert_log_path + '.1', self._alert_log_path):
+            try:
+                with open(path, 'r') as f:
+                    for line in f:
+                        try:
+                            alert = _json_loads(line)
+                            ts = alert.get('ts')
+                            if ts is None:
+                                ts = datetime.fromisoformat(alert['timestamp']).timestamp()
+                            # Skip what this process already counted live
+                            if horizon <= ts < self._counts_since:
+                                self._count_alert(
+                                    ts,
+                                    alert.get('severity', 'unknown'),
+                                    alert.get('type', 'unknown')
+                                )
+                        except (ValueError, KeyError):
+                            continue
+            except OSError:
+                continue
+        self._backfilled = True
+
+    def _summary_from_counts(self, cutoff_ts):
+        """Sum the in-memory hour buckets at or after the cutoff"""
+        summary = {
+            'total': 0,
+            'high': 0,
+            'medium': 0,
+            'low': 0,
+            'by_type': {}
+        }
+        cutoff_bucket = int(cutoff_ts // 3600)
+
+        with self._counts_lock:
+            for bucket, counts in self._hour_counts.items():
+                if bucket < cutoff_bucket:
+                    continue
+                summary['total'] += counts['total']
+                summary['high'] += counts['high']
+                summary['medium'] += counts['medium']
+                summary['low'] += counts['low']
+                by_type = summary['by_type']
+                for alert_type, count in counts['by_type'].items():
+                    by_type[alert_type] = by_type.get(alert_type, 0) + count
+
+        return summary
     
     def cleanup_old_logs(self, days=30):
         """Clean up log files older than specified days"""
         try:
-            cutoff_time = datetime.now() - timedelta(days=days)
-            
-            for filename in os.listdir(self.log_dir):
-                file_path = os.path.join(self.log_dir, filename)
-                
-                if os.path.isfile(file_path):
-                    file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    
-                    if file_mtime < cutoff_time:
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+
+            # DirEntry caches type and stat from the directory walk, so this
+            # is one batch of syscalls instead of 2-3 stats per file
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_ts:
                         try:
-                            os.remove(file_path)
-                            self.logger.info(f"Removed old log file: {filename}")
+                            os.remove(entry.path)
+                            self.logger.info(f"Removed old log file: {entry.name}")
                         except Exception as e:
-                            self.logger.error(f"Failed to remove old log file {filename}: {e}")
-        
+                            self.logger.error(f"Failed to remove old log file {entry.name}: {e}")
+
         except Exception as e:
             self.logger.error(f"Failed to cleanup old logs: {e}")
     
@@ -212,21 +418,31 @@ class SecurityLogger:
                 output_file = f"sentinelwatch_export_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.log"
             
             exported_lines = []
-            
+
             # Export from main log
             main_log = os.path.join(self.log_dir, 'sentinelwatch.log')
+            # The timestamp format is zero-padded and most-significant-first,
+            # so raw string comparison orders the same as the datetimes and
+            # no per-line strptime (or datetime allocation) is needed
+            start_stamp = start_date.strftime('%Y-%m-%d %H:%M:%S').encode('ascii')
+            end_stamp = end_date.strftime('%Y-%m-%d %H:%M:%S').encode('ascii')
+
             if os.path.exists(main_log):
-                with open(main_log, 'r') as f:
-                    for line in f:
-                        try:
-                            # Parse timestamp from log line
-                            timestamp_str = line.split(' - ')[0]
-                            log_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                            
-                            if start_date <= log_time <= end_date:
-                                exported_lines.append(line.strip())
-                        except (ValueError, IndexError):
+                with open(main_log, 'rb') as f:
+                    # Lines are appended in time order, so bisect by byte
+                    # offset to the window start instead of parsing the
+                    # whole file up to it
+                    f.seek(self._seek_to_time(f, os.path.getsize(main_log), start_stamp))
+                    for raw_line in f:
+                        stamp = raw_line[:19]
+                        if not _looks_like_stamp(stamp):
                             continue
+                        if stamp > end_stamp:
+                            break
+                        if stamp >= start_stamp:
+                            exported_lines.append(
+                                raw_line.decode('utf-8', errors='replace').strip()
+                            )
             
             # Write exported logs
             with open(output_file, 'w') as f:
@@ -239,7 +455,40 @@ class SecurityLogger:
                     f.write(line + '\n')
             
             return output_file
-        
+
         except Exception as e:
             self.logger.error(f"Failed to export logs: {e}")
             return None
+
+    def _seek_to_time(self, f, size, start_stamp):
+        """Bisect a time-ordered log for a safe offset to start scanning.
+
+        Returns a line-start offset known to sit at or before the first
+        line inside the window; the caller's scan still filters per line,
+        so landing a few lines early only costs a few extra comparisons.
+        """
+        lo, hi = 0, size
+        safe_offset = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            if mid:
+                f.readline()  # advance to the next line boundary
+
+            # Find the first timestamped line at or after the boundary
+            line_start = f.tell()
+            stamp = None
+            while stamp is None:
+                line = f.readline()
+                if not line:
+                    break
+                candidate = line[:19]
+                if _looks_like_stamp(candidate):
+                    stamp = candidate
+
+            if stamp is None or stamp >= start_stamp:
+                hi = mid
+            else:
+                safe_offset = line_start
+                lo = mid + 1
+        return safe_offset